@@ -2,12 +2,18 @@
 import os
 import sys
 import asyncio
+import copy
 import logging
 import tempfile
 import subprocess
 import shutil
+import signal
+import time
+from collections import deque
 from urllib.parse import urlparse
 from yt_dlp import YoutubeDL
+from yt_dlp.cookies import YoutubeDLCookieJar
+from yt_dlp.utils import DownloadCancelled
 from telegram import Update, InputFile
 from telegram.ext import Application, MessageHandler, CommandHandler, filters, ContextTypes
 from telegram.constants import ParseMode
@@ -19,6 +25,11 @@ TARGET_GROUP_ID = xxxxxxxxxxxxx
 MAX_PART_MB = 43
 SPLIT_THRESHOLD = 50 * 1024 * 1024
 SITE_LOG_FILE = "sitelog.txt"
+COOKIE_DIR = "cookies"
+YDL_POOL_SIZE = 4
+DOMAIN_CONCURRENCY = 2
+MAX_FFMPEG_JOBS = max(1, (os.cpu_count() or 1) // 4)
+MIN_FREE_DISK_MB = 512
 
 # Logging setup
 logging.basicConfig(
@@ -28,14 +39,22 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Global variables
-download_queue = asyncio.Queue()
-processing_task = None
+pending_links = deque()
 queue_lock = asyncio.Lock()
-cancel_requested = False
+job_workers = 4
+worker_tasks = set()
+active_jobs = {}
+domain_active = {}
+next_job_id = 0
+jobs_changed = asyncio.Event()
+ffmpeg_slots = asyncio.Semaphore(MAX_FFMPEG_JOBS)
+disk_freed = asyncio.Event()
 extra_caption = {"count": 0, "text": ""}
 processing_delay = 15
 part_upload_delay = 0
 full_video_caption = "🔥 Complete Video"
+status_edit_interval = 3
+chat_editors = {}
 
 # Load supported sites
 SUPPORTED_SITES = set()
@@ -66,6 +85,23 @@ internal_opts = aria2_opts.copy()
 internal_opts.pop('downloader', None)
 internal_opts.pop('downloader_args', None)
 
+metadata_opts = internal_opts.copy()
+metadata_opts['skip_download'] = True
+
+YDL_PROFILES = {
+    'aria2': aria2_opts,
+    'internal': internal_opts,
+    'metadata': metadata_opts,
+}
+
+# Long-lived YoutubeDL instances per profile, so extractors, cookies and
+# HTTP connections are reused across links instead of rebuilt per attempt
+ydl_pool = {profile: [] for profile in YDL_PROFILES}
+# Progress hook of the job currently holding each pooled instance
+ydl_job_hooks = {}
+# One cookie jar per profile, shared by all of its pooled instances
+profile_cookies = {}
+
 # Utility functions
 def get_domain(url):
     """Extract scheme://netloc from URL"""
@@ -83,10 +119,61 @@ def add_supported_site(domain):
     SUPPORTED_SITES.add(domain)
     # Atomic write to avoid corruption
     temp_file = f"{SITE_LOG_FILE}.tmp"
-    with open(temp_file, 'a') as f:
-        f.write(f"{domain}\n")
+    with open(temp_file, 'w') as f:
+        f.write("".join(f"{site}\n" for site in sorted(SUPPORTED_SITES)))
     os.replace(temp_file, SITE_LOG_FILE)
 
+def format_mb(num_bytes):
+    """Format a byte count as megabytes"""
+    return f"{num_bytes / (1024 * 1024):.1f}MB"
+
+def download_progress_line(method_name, d):
+    """Build a status line from a yt-dlp progress hook dict"""
+    done = d.get('downloaded_bytes') or 0
+    total = d.get('total_bytes') or d.get('total_bytes_estimate')
+    line = f"⬇️ {method_name}: {format_mb(done)}"
+    if total:
+        line += f" / {format_mb(total)} ({done * 100 / total:.0f}%)"
+    if d.get('speed'):
+        line += f" · {format_mb(d['speed'])}/s"
+    return line
+
+def run_ffmpeg(cmd, on_progress=None):
+    """Run ffmpeg, reporting seconds of output written via -progress"""
+    if on_progress is None:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return
+    cmd = cmd[:1] + ['-progress', 'pipe:1', '-nostats'] + cmd[1:]
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as proc:
+        try:
+            for line in proc.stdout:
+                key, _, value = line.strip().partition('=')
+                # out_time_ms is in microseconds as well, despite its name
+                if key in ('out_time_us', 'out_time_ms') and value.isdigit():
+                    on_progress(int(value) / 1_000_000)
+        except BaseException:
+            # on_progress raises to abort, e.g. when the job is cancelled
+            proc.kill()
+            raise
+
+def kill_job_processes(job_dir):
+    """Kill our aria2c/ffmpeg children working in job_dir (needs /proc)"""
+    if not os.path.isdir('/proc'):
+        return
+    for pid in os.listdir('/proc'):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f'/proc/{pid}/stat', 'rb') as f:
+                ppid = int(f.read().rsplit(b')', 1)[1].split()[1])
+            if ppid != os.getpid():
+                continue
+            with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                if job_dir.encode() in f.read():
+                    os.kill(int(pid), signal.SIGKILL)
+        except (OSError, ValueError, IndexError):
+            continue
+
 def check_ffmpeg_installed():
     """Check if ffmpeg and ffprobe are available"""
     try:
@@ -112,7 +199,7 @@ def extract_thumbnail(video_path, thumb_path, ratio=0.3):
     except Exception:
         return False
 
-def split_video_streamcopy(video_path, output_dir, max_part_size_mb):
+def split_video_streamcopy(video_path, output_dir, max_part_size_mb, on_progress=None):
     """Split video using stream copy (fast but less precise)"""
     os.makedirs(output_dir, exist_ok=True)
     part_paths = []
@@ -130,7 +217,7 @@ def split_video_streamcopy(video_path, output_dir, max_part_size_mb):
         out_path = os.path.join(output_dir, f"part{idx}.mp4")
         cmd = ['ffmpeg', '-y', '-ss', str(start), '-i', video_path, '-t', str(target_sec),
                '-c', 'copy', '-avoid_negative_ts', 'make_zero', '-movflags', '+faststart', out_path]
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        run_ffmpeg(cmd, on_progress and (lambda t, start=start: on_progress(start + t, duration)))
         if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
             part_paths.append(out_path)
         else:
@@ -139,7 +226,7 @@ def split_video_streamcopy(video_path, output_dir, max_part_size_mb):
         idx += 1
     return part_paths
 
-def split_video_fallback_reencode(video_path, output_dir, max_part_size_mb):
+def split_video_fallback_reencode(video_path, output_dir, max_part_size_mb, on_progress=None):
     """Split video with re-encoding (slower but more reliable)"""
     os.makedirs(output_dir, exist_ok=True)
     part_paths = []
@@ -158,7 +245,7 @@ def split_video_fallback_reencode(video_path, output_dir, max_part_size_mb):
         cmd = ['ffmpeg', '-y', '-ss', str(start), '-i', video_path, '-t', str(target_sec),
                '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '28',
                '-c:a', 'aac', '-b:a', '128k', '-movflags', '+faststart', out_path]
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        run_ffmpeg(cmd, on_progress and (lambda t, start=start: on_progress(start + t, duration)))
         if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
             part_paths.append(out_path)
         else:
@@ -167,6 +254,64 @@ def split_video_fallback_reencode(video_path, output_dir, max_part_size_mb):
         idx += 1
     return part_paths
 
+def _job_progress_hook(ydl):
+    """Forward progress of a pooled YoutubeDL to the current job's hook"""
+    def hook(d):
+        callback = ydl_job_hooks.get(ydl)
+        if callback:
+            callback(d)
+    return hook
+
+def get_profile_cookies(profile):
+    """Load the shared cookie jar for profile from COOKIE_DIR"""
+    jar = profile_cookies.get(profile)
+    if jar is None:
+        os.makedirs(COOKIE_DIR, exist_ok=True)
+        jar = YoutubeDLCookieJar(os.path.join(COOKIE_DIR, f"{profile}.txt"))
+        if os.path.exists(jar.filename):
+            jar.load(ignore_discard=True, ignore_expires=True)
+        profile_cookies[profile] = jar
+    return jar
+
+def acquire_ydl(profile, job_dir, progress_hook=None):
+    """Take a pooled YoutubeDL for profile, writing output into job_dir"""
+    idle = ydl_pool[profile]
+    if idle:
+        ydl = idle.pop()
+    else:
+        ydl = YoutubeDL(dict(YDL_PROFILES[profile]))
+        ydl.add_progress_hook(_job_progress_hook(ydl))
+    # Start from the cookies other instances of this profile have seen
+    for cookie in get_profile_cookies(profile):
+        ydl.cookiejar.set_cookie(cookie)
+    ydl.params['paths'] = {'home': job_dir}
+    ydl_job_hooks[ydl] = progress_hook
+    return ydl
+
+def release_ydl(profile, ydl):
+    """Persist cookies and return a YoutubeDL to the pool"""
+    jar = get_profile_cookies(profile)
+    for cookie in ydl.cookiejar:
+        jar.set_cookie(cookie)
+    try:
+        jar.save(ignore_discard=True, ignore_expires=True)
+    except Exception as e:
+        logger.warning(f"Could not save {profile} cookies: {e}")
+    ydl.params['paths'] = {}
+    ydl_job_hooks.pop(ydl, None)
+    if len(ydl_pool[profile]) < YDL_POOL_SIZE:
+        ydl_pool[profile].append(ydl)
+    else:
+        ydl.close()
+
+def discard_ydl(ydl):
+    """Close a YoutubeDL that must not go back to the pool"""
+    ydl_job_hooks.pop(ydl, None)
+    try:
+        ydl.close()
+    except Exception as e:
+        logger.warning(f"Could not close YoutubeDL: {e}")
+
 # Command handlers
 async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show welcome message with all commands"""
@@ -180,7 +325,9 @@ async def handle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "/capedit - Edit default full video caption",
         "/delay &lt;N&gt; - Set delay between links (seconds)",
         "/slow &lt;N&gt; - Set delay between parts (0-30s)",
-        "/cancel - Stop current download",
+        "/interval &lt;N&gt; - Set min gap between status edits (1-60s)",
+        "/workers &lt;N&gt; - Set number of parallel jobs (1-32)",
+        "/cancel [ID] - Stop one job, or all running jobs",
         "/clean - Cancel + Clear queue",
         "/skip &lt;N&gt; - Skip next N links",
         "/remain - Show pending links",
@@ -208,9 +355,11 @@ async def handle_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
 <b>⏱️ Timing Control</b>
 /delay N - Set delay between links (seconds)
 /slow N - Set delay between parts (0-30s)
+/interval N - Set min gap between status edits (1-60s)
+/workers N - Set number of parallel jobs (1-32)
 
 <b>🛠️ Queue Management</b>
-/cancel - Stop current download
+/cancel [ID] - Stop one job, or all running jobs
 /clean - Cancel + Clear queue
 /skip N - Skip next N links
 /remain - Show pending links
@@ -292,6 +441,55 @@ async def handle_slow(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except ValueError as e:
         await update.message.reply_text(f"❌ Invalid value: {e}\nUsage: /slow <0-30>")
 
+async def handle_interval(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Set minimum interval between status message edits"""
+    global status_edit_interval
+    
+    if update.effective_user.id not in ADMIN_IDS:
+        return
+    
+    if not context.args:
+        await update.message.reply_text(
+            f"🔁 Current interval between status edits: {status_edit_interval} seconds\n"
+            "Usage: /interval <1-60>"
+        )
+        return
+    
+    try:
+        new_interval = int(context.args[0])
+        if new_interval < 1 or new_interval > 60:
+            raise ValueError("Interval must be between 1 and 60 seconds")
+        
+        status_edit_interval = new_interval
+        await update.message.reply_text(f"🔁 Interval between status edits set to {status_edit_interval} seconds")
+    except ValueError as e:
+        await update.message.reply_text(f"❌ Invalid value: {e}\nUsage: /interval <1-60>")
+
+async def handle_workers(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Set number of links processed at the same time"""
+    global job_workers
+    
+    if update.effective_user.id not in ADMIN_IDS:
+        return
+    
+    if not context.args:
+        await update.message.reply_text(
+            f"⚙️ Current parallel jobs: {job_workers} (max {DOMAIN_CONCURRENCY} per site)\n"
+            "Usage: /workers <1-32>"
+        )
+        return
+    
+    try:
+        new_workers = int(context.args[0])
+        if new_workers < 1 or new_workers > 32:
+            raise ValueError("Workers must be between 1 and 32")
+        
+        job_workers = new_workers
+        await update.message.reply_text(f"⚙️ Parallel jobs set to {job_workers}")
+        await process_queue(context)
+    except ValueError as e:
+        await update.message.reply_text(f"❌ Invalid value: {e}\nUsage: /workers <1-32>")
+
 async def handle_cap(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Add extra caption to next N videos"""
     global extra_caption
@@ -317,39 +515,49 @@ async def handle_cap(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 async def handle_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Cancel current download"""
-    global cancel_requested, processing_task
-    
+    """Cancel one running job, or all of them"""
     if update.effective_user.id not in ADMIN_IDS:
         return
     
-    if cancel_requested:
-        await update.message.reply_text("⏳ A cancel is already pending!")
-        return
+    if context.args:
+        if not context.args[0].isdigit():
+            await update.message.reply_text("Usage: /cancel [job_id]")
+            return
+        job = active_jobs.get(int(context.args[0]))
+        if not job:
+            await update.message.reply_text(f"❌ No active job #{context.args[0]} to cancel")
+            return
+        jobs = [job]
+    else:
+        jobs = list(active_jobs.values())
+        if not jobs:
+            await update.message.reply_text("❌ No active download to cancel")
+            return
     
-    if not processing_task or processing_task.done():
-        await update.message.reply_text("❌ No active download to cancel")
+    jobs = [job for job in jobs if not job.cancelled]
+    if not jobs:
+        await update.message.reply_text("⏳ A cancel is already pending!")
         return
     
-    cancel_requested = True
-    processing_task.cancel()
-    await update.message.reply_text("🛑 Download cancelled! Cleaning up...")
+    for job in jobs:
+        job.cancel()
+    job_list = ", ".join(f"#{job.id}" for job in jobs)
+    await update.message.reply_text(f"🛑 Download {job_list} cancelled! Cleaning up...")
 
 async def handle_clean(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Cancel + Clear queue"""
-    global cancel_requested, processing_task, extra_caption
+    global extra_caption
     
     if update.effective_user.id not in ADMIN_IDS:
         return
     
-    if processing_task and not processing_task.done():
-        cancel_requested = True
-        processing_task.cancel()
+    for job in list(active_jobs.values()):
+        job.cancel()
     
     async with queue_lock:
-        while not download_queue.empty():
-            download_queue.get_nowait()
+        pending_links.clear()
         extra_caption = {"count": 0, "text": ""}
+        jobs_changed.set()
     
     await update.message.reply_text("🧹 Queue cleared! All pending links removed.")
 
@@ -368,20 +576,21 @@ async def handle_skip(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     async with queue_lock:
-        queue_size = download_queue.qsize()
+        queue_size = len(pending_links)
         
         if skip_count >= queue_size:
             await update.message.reply_text(f"⚠️ Skip count {skip_count} is larger than queue size {queue_size}. Clearing queue instead.")
-            while not download_queue.empty():
-                download_queue.get_nowait()
+            pending_links.clear()
             extra_caption = {"count": 0, "text": ""}
+            jobs_changed.set()
             return
         
         skipped_links = []
         for _ in range(skip_count):
-            if not download_queue.empty():
-                link, _ = download_queue.get_nowait()
+            if pending_links:
+                link, _ = pending_links.popleft()
                 skipped_links.append(link)
+        jobs_changed.set()
         
         if skipped_links:
             filename = f"Skipped_{len(skipped_links)}_Links.txt"
@@ -395,7 +604,7 @@ async def handle_skip(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 )
             os.remove(filename)
         
-        remaining = download_queue.qsize()
+        remaining = len(pending_links)
         await update.message.reply_text(
             f"⏭️ Successfully skipped {len(skipped_links)} links\n"
             f"📊 Remaining links in queue: {remaining}"
@@ -408,7 +617,7 @@ async def handle_remain(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     links = []
     async with queue_lock:
-        for item in list(download_queue._queue):
+        for item in pending_links:
             links.append(item[0])
     
     if not links:
@@ -459,6 +668,186 @@ async def handle_support_file(update: Update, context: ContextTypes.DEFAULT_TYPE
     os.remove(filename)
 
 # Download and processing functions
+class LiveStatus:
+    """Single status message per job, edited in place as the job progresses"""
+
+    def __init__(self, update, header):
+        self.update = update
+        self.header = header
+        self.line = ""
+        self.message = None
+        self.sent_text = None
+        self.closing = False
+
+    def set(self, line):
+        """Record the latest status line (safe to call from worker threads)"""
+        self.line = line
+
+    def render(self):
+        return f"{self.header}\n\n{self.line}" if self.line else self.header
+
+    def pending(self):
+        return self.message is not None and self.render() != self.sent_text
+
+    async def start(self):
+        """Send the status message and hand it to the chat's editor"""
+        self.sent_text = self.render()
+        self.message = await self.update.message.reply_text(self.sent_text)
+        get_chat_editor(self.message.chat.id).add(self)
+
+    async def edit(self):
+        text = self.render()
+        # Count failed edits as sent so a deleted message isn't retried forever
+        self.sent_text = text
+        try:
+            await self.message.edit_text(text)
+        except Exception as e:
+            logger.warning(f"Status edit failed: {e}")
+
+    def detach(self):
+        """Stop tracking the message without waiting for a final edit"""
+        editor = chat_editors.get(self.message.chat.id) if self.message else None
+        if editor and self in editor.statuses:
+            editor.statuses.remove(self)
+
+    def close(self, line=None):
+        """Leave the final state for the chat's editor to write, then drop"""
+        if line is not None:
+            self.line = line
+        self.closing = True
+
+class ChatEditor:
+    """Edits one chat's status messages at most once per status_edit_interval,
+    taking turns between the jobs that have changes to show"""
+
+    def __init__(self, chat_id):
+        self.chat_id = chat_id
+        self.statuses = deque()
+        self.last_edit = time.monotonic()
+        self._task = asyncio.create_task(self._run())
+
+    def add(self, status):
+        self.last_edit = time.monotonic()
+        self.statuses.append(status)
+
+    def _drop_finished(self):
+        for status in list(self.statuses):
+            if status.closing and not status.pending():
+                self.statuses.remove(status)
+
+    def _next_pending(self):
+        # Rotate so the job edited last goes to the back of the line
+        for _ in range(len(self.statuses)):
+            status = self.statuses[0]
+            self.statuses.rotate(-1)
+            if status.pending():
+                return status
+        return None
+
+    async def _run(self):
+        while True:
+            self._drop_finished()
+            if not self.statuses:
+                chat_editors.pop(self.chat_id, None)
+                return
+            status = self._next_pending()
+            if status is None:
+                await asyncio.sleep(1)
+                continue
+            delay = self.last_edit + status_edit_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if status.pending():
+                self.last_edit = time.monotonic()
+                await status.edit()
+
+def get_chat_editor(chat_id):
+    """Return the running status editor for chat_id, starting one if needed"""
+    editor = chat_editors.get(chat_id)
+    if editor is None:
+        editor = chat_editors[chat_id] = ChatEditor(chat_id)
+    return editor
+
+class Job:
+    """A queued link taken by a worker, cancellable on its own"""
+
+    def __init__(self, job_id, link, update, domain):
+        self.id = job_id
+        self.link = link
+        self.update = update
+        self.domain = domain
+        self.cancelled = False
+        self.task = None
+        self.dir = None
+        self.disk_reserved = 0
+
+    def cancel(self):
+        # Cancelling twice would interrupt the wait for the job's thread
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self.task:
+            self.task.cancel()
+
+def expected_download_size(info):
+    """Estimate download size in bytes from yt-dlp metadata, 0 if unknown"""
+    formats = info.get('requested_formats') or [info]
+    return sum(f.get('filesize') or f.get('filesize_approx') or 0 for f in formats)
+
+def dir_size(path):
+    """Total size of the files under path"""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+def disk_still_needed(exclude=None):
+    """Bytes running jobs have reserved but not written yet"""
+    return sum(
+        max(0, job.disk_reserved - dir_size(job.dir))
+        for job in active_jobs.values()
+        if job is not exclude and job.disk_reserved and job.dir
+    )
+
+async def reserve_disk_space(job, status, expected_bytes):
+    """Wait until the job's download and split parts fit on disk next to
+    what running jobs still have to write. Returns False if they never can"""
+    need = expected_bytes * 2
+    while True:
+        if job.cancelled:
+            raise asyncio.CancelledError()
+        free = shutil.disk_usage(tempfile.gettempdir()).free
+        if free - disk_still_needed(job) - need >= MIN_FREE_DISK_MB * 1024 * 1024:
+            job.disk_reserved = need
+            return True
+        # Nothing else will free space, so waiting can't help
+        if not any(other.disk_reserved for other in active_jobs.values() if other is not job):
+            return False
+        status.set(f"💾 Waiting for free disk space ({format_mb(need)} needed)...")
+        disk_freed.clear()
+        try:
+            await asyncio.wait_for(disk_freed.wait(), 10)
+        except asyncio.TimeoutError:
+            pass
+
+async def run_in_job_thread(job_dir, func, *args):
+    """Run func in a thread. If the job is cancelled, kill its subprocesses
+    and wait for the thread so nothing outlives the job's tmpdir or slots"""
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            kill_job_processes(job_dir)
+            await asyncio.wait({future}, timeout=1)
+        if not future.cancelled():
+            future.exception()
+        raise
+
 async def send_video(update, context, path, caption, thumb_path):
     """Send video to chat and target group"""
     global extra_caption
@@ -489,167 +878,248 @@ async def send_video(update, context, path, caption, thumb_path):
     except Exception as e:
         logger.error(f"Upload failed: {e}")
 
-async def countdown(update, seconds):
-    """Show countdown before next download"""
-    msg = await update.message.reply_text(f"⏳ Starting next link in {seconds}s...")
-    for i in range(seconds - 1, 0, -1):
+async def countdown(status, seconds):
+    """Show countdown before next download on the job's status message"""
+    final_line = status.line
+    for i in range(seconds, 0, -1):
+        status.set(f"{final_line}\n⏳ Starting next link in {i}s...")
         await asyncio.sleep(1)
-        try:
-            await msg.edit_text(f"⏳ Starting next link in {i}s...")
-        except Exception:
-            break
-    await msg.delete()
+    status.set(final_line)
 
-async def attempt_download(update: Update, url: str, ydl_opts: dict, method_name: str):
-    """Attempt download with specific method"""
-    global cancel_requested
-    
+async def attempt_download(status, job, profile: str, method_name: str, job_dir: str, meta: dict):
+    """Attempt download with specific method, reusing the extracted metadata"""
+    url = job.link
     domain = get_domain(url)
-    status_msg = await update.message.reply_text(f"🔄 Attempting {method_name} download...")
+    status.set(f"🔄 Attempting {method_name} download...")
+
+    def _progress(d):
+        # Runs in the download thread; raising here aborts yt-dlp
+        if job.cancelled:
+            raise DownloadCancelled()
+        if d.get('status') == 'downloading':
+            status.set(download_progress_line(method_name, d))
+
+    ydl = acquire_ydl(profile, job_dir, _progress)
     
     try:
-        ydl = YoutubeDL(ydl_opts)
-        info = ydl.extract_info(url, download=True)
+        try:
+            info = await run_in_job_thread(job_dir, ydl.process_ie_result, copy.deepcopy(meta), True)
+        except asyncio.CancelledError:
+            # Waiting for the thread may itself have been interrupted
+            discard_ydl(ydl)
+            ydl = None
+            raise
         
-        if cancel_requested:
+        if job.cancelled:
             raise asyncio.CancelledError()
             
         video_path = ydl.prepare_filename(info)
         if os.path.exists(video_path) and os.path.getsize(video_path) > 0:
-            await status_msg.edit_text(f"✅ {method_name} succeeded!")
+            status.set(f"✅ {method_name} succeeded!")
             if domain:
                 add_supported_site(domain)
             return info
         else:
-            await status_msg.edit_text(f"⚠️ {method_name} failed: Empty file")
+            status.set(f"⚠️ {method_name} failed: Empty file")
             return None
             
     except Exception as e:
         error_msg = str(e)[:200]
-        await status_msg.edit_text(f"⚠️ {method_name} failed: {error_msg}")
+        status.set(f"⚠️ {method_name} failed: {error_msg}")
         return None
     finally:
+        if ydl is not None:
+            release_ydl(profile, ydl)
         await asyncio.sleep(1)  # Small delay between attempts
 
-async def handle_video(update: Update, context: ContextTypes.DEFAULT_TYPE, url: str):
-    """Handle video download and processing"""
-    global cancel_requested, part_upload_delay, full_video_caption
-    tmpdir = tempfile.mkdtemp(prefix="tgvidbot_")
-    os.chdir(tmpdir)
+async def handle_video(update: Update, context: ContextTypes.DEFAULT_TYPE, job, status):
+    """Handle video download and processing, returning True on success"""
+    global part_upload_delay, full_video_caption
+    url = job.link
+    tmpdir = tempfile.mkdtemp(prefix=f"tgvidbot_{job.id}_")
+    job.dir = tmpdir
 
     def _check_cancel():
-        if cancel_requested:
+        if job.cancelled:
             raise asyncio.CancelledError()
 
+    def _split_progress(done, total):
+        _check_cancel()
+        status.set(f"✂️ Splitting into {MAX_PART_MB}MB parts... {done * 100 / total:.0f}%")
+
     try:
+        status.set("🔎 Reading video info...")
+        ydl = acquire_ydl('metadata', tmpdir)
+        try:
+            meta = await run_in_job_thread(tmpdir, ydl.extract_info, url, False)
+        except asyncio.CancelledError:
+            discard_ydl(ydl)
+            ydl = None
+            raise
+        except Exception as e:
+            # Both methods share the extractor, so neither could download it
+            status.set(
+                f"❌ Could not read video info!\n"
+                f"Domain: {get_domain(url) or url}\n"
+                f"Reason: {str(e)[:200]}"
+            )
+            return False
+        finally:
+            if ydl is not None:
+                release_ydl('metadata', ydl)
+
+        expected_bytes = expected_download_size(meta)
+        if not await reserve_disk_space(job, status, expected_bytes):
+            free = shutil.disk_usage(tempfile.gettempdir()).free
+            status.set(
+                f"❌ Not enough disk space!\n"
+                f"Needed: {format_mb(expected_bytes * 2 + MIN_FREE_DISK_MB * 1024 * 1024)}, free: {format_mb(free)}"
+            )
+            return False
+        _check_cancel()
+
         # First attempt with aria2c
-        info = await attempt_download(update, url, aria2_opts, "aria2c")
+        info = await attempt_download(status, job, 'aria2', "aria2c", tmpdir, meta)
         _check_cancel()
         
         # Fallback to yt-dlp if aria2c failed
         if not info:
-            info = await attempt_download(update, url, internal_opts, "yt-dlp")
+            info = await attempt_download(status, job, 'internal', "yt-dlp", tmpdir, meta)
             _check_cancel()
             
             if not info:
                 domain = get_domain(url) or url
-                await update.message.reply_text(
+                status.set(
                     f"❌ Both methods failed!\n"
                     f"Domain: {domain}\n"
                     f"Reason: Could not download video"
                 )
-                return
+                return False
 
         # Process the downloaded video
-        video_path = YoutubeDL(internal_opts).prepare_filename(info)
+        ydl = acquire_ydl('metadata', tmpdir)
+        try:
+            video_path = ydl.prepare_filename(info)
+        finally:
+            release_ydl('metadata', ydl)
         title = info.get('title', 'Video')
         size = os.path.getsize(video_path)
         _check_cancel()
 
         if size <= SPLIT_THRESHOLD:
             thumb_path = os.path.join(tmpdir, 'thumb.jpg')
-            extract_thumbnail(video_path, thumb_path)
-            await update.message.reply_text("📤 Uploading full video...")
+            async with ffmpeg_slots:
+                await run_in_job_thread(tmpdir, extract_thumbnail, video_path, thumb_path)
+            status.set(f"📤 Uploading full video ({format_mb(size)})...")
             _check_cancel()
             await send_video(update, context, video_path, f"🎬 {title}\n{full_video_caption}", thumb_path)
         else:
-            await update.message.reply_text("✂️ Splitting into 45MB parts...")
+            status.set(f"✂️ Splitting into {MAX_PART_MB}MB parts...")
             parts_dir = os.path.join(tmpdir, "parts")
             os.makedirs(parts_dir, exist_ok=True)
-            parts = split_video_streamcopy(video_path, parts_dir, MAX_PART_MB)
-            if not parts:
-                parts = split_video_fallback_reencode(video_path, parts_dir, MAX_PART_MB)
+            async with ffmpeg_slots:
+                parts = await run_in_job_thread(tmpdir, split_video_streamcopy, video_path, parts_dir, MAX_PART_MB, _split_progress)
+                if not parts:
+                    parts = await run_in_job_thread(tmpdir, split_video_fallback_reencode, video_path, parts_dir, MAX_PART_MB, _split_progress)
 
+            total_bytes = sum(os.path.getsize(part) for part in parts)
+            sent_bytes = 0
             for i, part in enumerate(parts, 1):
                 _check_cancel()
                 thumb_path = os.path.join(tmpdir, f"thumb_{i}.jpg")
-                extract_thumbnail(part, thumb_path)
-                await update.message.reply_text(f"📤 Uploading part {i}/{len(parts)}...")
+                async with ffmpeg_slots:
+                    await run_in_job_thread(tmpdir, extract_thumbnail, part, thumb_path)
+                status.set(
+                    f"📤 Uploading part {i}/{len(parts)}... "
+                    f"{format_mb(sent_bytes)} / {format_mb(total_bytes)} sent"
+                )
                 await send_video(update, context, part, f"🎬 Part {i}/{len(parts)} - {title}", thumb_path)
+                sent_bytes += os.path.getsize(part)
                 
                 if i < len(parts) and part_upload_delay > 0:
                     await asyncio.sleep(part_upload_delay)
+        return True
 
     except asyncio.CancelledError:
-        logger.info("Download cancelled by user")
+        logger.info(f"Job #{job.id} cancelled by user")
         raise
     except Exception as e:
         logger.error("Exception occurred", exc_info=True)
-        await update.message.reply_text(f"❌ Processing error: {str(e)[:200]}")
+        status.set(f"❌ Processing error: {str(e)[:200]}")
+        return False
     finally:
-        os.chdir("..")
         shutil.rmtree(tmpdir, ignore_errors=True)
 
-async def process_queue(context: ContextTypes.DEFAULT_TYPE):
-    """Process download queue"""
-    global processing_task, cancel_requested
-    if processing_task and not processing_task.done():
-        return
+async def take_next_job():
+    """Wait for a queued link whose domain is below its concurrency cap"""
+    global next_job_id
+    while True:
+        async with queue_lock:
+            if not pending_links:
+                return None
+            # Pick the oldest link whose site has a free slot, so one slow
+            # domain can't hold up links for the others
+            for index, (link, update) in enumerate(pending_links):
+                domain = get_domain(link) or link
+                if domain_active.get(domain, 0) < DOMAIN_CONCURRENCY:
+                    del pending_links[index]
+                    domain_active[domain] = domain_active.get(domain, 0) + 1
+                    next_job_id += 1
+                    job = Job(next_job_id, link, update, domain)
+                    active_jobs[job.id] = job
+                    return job
+            jobs_changed.clear()
+        await jobs_changed.wait()
 
-    async def _run():
-        global cancel_requested
-        processed_count = 0
-        while not download_queue.empty():
-            queue_size = download_queue.qsize() + processed_count
-            cancel_requested = False
-            link, update = await download_queue.get()
+def finish_job(job):
+    """Release the job's domain slot and disk reservation, wake waiting workers"""
+    active_jobs.pop(job.id, None)
+    job.disk_reserved = 0
+    disk_freed.set()
+    domain_active[job.domain] -= 1
+    if domain_active[job.domain] <= 0:
+        del domain_active[job.domain]
+    jobs_changed.set()
+
+async def job_worker(context: ContextTypes.DEFAULT_TYPE):
+    """Process queued links one job at a time until the queue is empty"""
+    try:
+        while len(worker_tasks) <= job_workers:
+            job = await take_next_job()
+            if job is None:
+                return
+            status = LiveStatus(job.update, f"🔄 Job #{job.id} (/cancel {job.id})\n🔗 Link: {job.link}")
             try:
-                processed_count += 1
-                processing_msg = await update.message.reply_text(
-                    f"🔄 Processing: {processed_count} / {queue_size}\n🔗 Link: {link}"
-                )
-                await handle_video(update, context, link)
-                await processing_msg.delete()
-                remain = queue_size - processed_count
-                await update.message.reply_text(
-                    f"✅ Last processed link: {processed_count} / {queue_size}\n"
-                    f"Remain Links: {remain}\n\n"
-                    f"🔗 Link: {link}"
-                )
-            except asyncio.CancelledError:
-                logger.info("Download was cancelled")
-                await update.message.reply_text("🛑 Process cancelled successfully!")
-                await asyncio.sleep(15)
-            except Exception as e:
-                logger.error(f"Error processing {link}: {e}")
-
-            remain = download_queue.qsize()
-            if processed_count % 5 == 0 and remain > 0:
-                filename = f"Remain_Links_{remain}.txt"
-                with open(filename, 'w', encoding='utf-8') as f:
-                    for lnk, _ in list(download_queue._queue):
-                        f.write(lnk + '\n')
-                with open(filename, 'rb') as f:
-                    await update.message.reply_document(
-                        document=InputFile(f, filename=filename),
-                        caption=f"📄 Processing {processed_count}/{queue_size} links in queue\nRemain: {remain}"
-                    )
-                os.remove(filename)
-
-            if not download_queue.empty() and not cancel_requested:
-                await countdown(update, processing_delay)
-
-    processing_task = asyncio.create_task(_run())
+                try:
+                    await status.start()
+                    job.task = asyncio.create_task(handle_video(job.update, context, job, status))
+                    if await job.task:
+                        status.set(f"✅ Done\nRemain Links: {len(pending_links)}")
+                except asyncio.CancelledError:
+                    if not job.cancelled:
+                        raise
+                    logger.info(f"Job #{job.id} was cancelled")
+                    status.set("🛑 Process cancelled successfully!")
+                except Exception as e:
+                    logger.error(f"Error processing {job.link}: {e}")
+                finally:
+                    finish_job(job)
+
+                if pending_links and not job.cancelled:
+                    await countdown(status, processing_delay)
+                status.close()
+            finally:
+                # Stop editing the message if the worker itself is cancelled
+                if not status.closing:
+                    status.detach()
+    finally:
+        worker_tasks.discard(asyncio.current_task())
+
+async def process_queue(context: ContextTypes.DEFAULT_TYPE):
+    """Start job workers for the download queue, up to job_workers"""
+    jobs_changed.set()
+    while len(worker_tasks) < min(job_workers, len(pending_links)):
+        worker_tasks.add(asyncio.create_task(job_worker(context)))
 
 async def handle_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle text or document input with URLs"""
@@ -673,9 +1143,9 @@ async def handle_input(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     async with queue_lock:
         for link in new_links:
-            await download_queue.put((link, update))
+            pending_links.append((link, update))
         await update.message.reply_text(
-            f"🆕 {len(new_links)} links added to list\n📊 Total Links in queue: {download_queue.qsize()}"
+            f"🆕 {len(new_links)} links added to list\n📊 Total Links in queue: {len(pending_links)}"
         )
 
     await process_queue(context)
@@ -694,6 +1164,8 @@ def main():
     app.add_handler(CommandHandler("capedit", handle_capedit))
     app.add_handler(CommandHandler("delay", handle_delay))
     app.add_handler(CommandHandler("slow", handle_slow))
+    app.add_handler(CommandHandler("interval", handle_interval))
+    app.add_handler(CommandHandler("workers", handle_workers))
     app.add_handler(CommandHandler("cap", handle_cap))
     app.add_handler(CommandHandler("cancel", handle_cancel))
     app.add_handler(CommandHandler("clean", handle_clean))